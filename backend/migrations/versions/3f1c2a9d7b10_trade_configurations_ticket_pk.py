@@ -0,0 +1,65 @@
+"""trade_configurations: make ticket the primary key and drop id
+
+Databases created before the model change have an integer `id` primary key
+and a separate unique index on `ticket`; db.create_all() never alters an
+existing table, so bring them in line with the model here. Tables that
+already match (e.g. created from the current models) are left untouched.
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLE = 'trade_configurations'
+
+
+def _columns(inspector):
+    return {c['name'] for c in inspector.get_columns(TABLE)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE) or 'id' not in _columns(inspector):
+        return
+
+    # One row per ticket: keep the first snapshot, as the app does
+    op.execute(
+        f"DELETE FROM {TABLE} WHERE ticket IS NULL "
+        f"OR id NOT IN (SELECT MIN(id) FROM {TABLE} GROUP BY ticket)"
+    )
+
+    pk_name = inspector.get_pk_constraint(TABLE).get('name')
+    if pk_name:
+        op.drop_constraint(pk_name, TABLE, type_='primary')
+    # The primary key index replaces the old unique index/constraint on ticket
+    for index in inspector.get_indexes(TABLE):
+        if index['column_names'] == ['ticket']:
+            op.drop_index(index['name'], table_name=TABLE)
+    for constraint in inspector.get_unique_constraints(TABLE):
+        if constraint['column_names'] == ['ticket']:
+            op.drop_constraint(constraint['name'], TABLE, type_='unique')
+
+    op.drop_column(TABLE, 'id')
+    op.alter_column(TABLE, 'ticket', existing_type=sa.BigInteger(), nullable=False)
+    op.create_primary_key(f'{TABLE}_pkey', TABLE, ['ticket'])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE) or 'id' in _columns(inspector):
+        return
+
+    op.drop_constraint(f'{TABLE}_pkey', TABLE, type_='primary')
+    op.execute(f"ALTER TABLE {TABLE} ADD COLUMN id SERIAL")
+    op.create_primary_key(f'{TABLE}_pkey', TABLE, ['id'])
+    op.create_index(f'ix_{TABLE}_ticket', TABLE, ['ticket'], unique=True)
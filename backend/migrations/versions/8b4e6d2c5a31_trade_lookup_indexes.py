@@ -0,0 +1,48 @@
+"""trade lookup indexes on trade_records and trade_configurations
+
+The composite indexes on trade_records and the single-column indexes on
+trade_configurations.user_id/bot_id are declared on the models, but
+db.create_all() only creates them together with a new table. Create any
+that an existing database is missing.
+
+Revision ID: 8b4e6d2c5a31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-15 12:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d2c5a31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - keep in step with models.py
+INDEXES = (
+    ('ix_traderecord_user_ticket',          'trade_records',        ['user_id', 'ticket']),
+    ('ix_traderecord_user_entrytime',       'trade_records',        ['user_id', 'entry_time']),
+    ('ix_traderecord_user_exittime',        'trade_records',        ['user_id', 'exit_time']),
+    ('ix_traderecord_bot_exittime',         'trade_records',        ['bot_id', 'exit_time']),
+    ('ix_trade_configurations_user_id',     'trade_configurations', ['user_id']),
+    ('ix_trade_configurations_bot_id',      'trade_configurations', ['bot_id']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if not inspector.has_table(table):
+            continue
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        if inspector.has_table(table) and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
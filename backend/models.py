@@ -1,9 +1,32 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 
 # Initialize SQLAlchemy (to be bound to app in candlestickData)
 db = SQLAlchemy()
 
+
+class BulkInsertMixin:
+    @classmethod
+    def bulk_insert(cls, session, records, chunk=1000):
+        """Insert a list of column dicts as multi-row INSERTs, `chunk` rows per statement (caller commits)"""
+        for i in range(0, len(records), chunk):
+            session.execute(insert(cls), records[i:i + chunk])
+
+    @classmethod
+    def bulk_insert_ignore(cls, session, records, index_elements, chunk=1000):
+        """
+        Like bulk_insert, but rows that clash on `index_elements` are skipped by the
+        database (ON CONFLICT DO NOTHING) instead of failing the whole statement
+        """
+        dialect = session.get_bind().dialect.name
+        dialect_insert = sqlite_insert if dialect == 'sqlite' else pg_insert
+        stmt = dialect_insert(cls).on_conflict_do_nothing(index_elements=index_elements)
+        for i in range(0, len(records), chunk):
+            session.execute(stmt, records[i:i + chunk])
+
 class User(db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -19,8 +42,14 @@ class User(db.Model):
         }
 
 
-class TradeRecord(db.Model):
+class TradeRecord(BulkInsertMixin, db.Model):
     __tablename__ = 'trade_records'
+    __table_args__ = (
+        db.Index('ix_traderecord_user_ticket',    'user_id', 'ticket'),      # per-ticket override lookups
+        db.Index('ix_traderecord_user_entrytime', 'user_id', 'entry_time'),  # recent-window scans
+        db.Index('ix_traderecord_user_exittime',  'user_id', 'exit_time'),   # recent closed supplement
+        db.Index('ix_traderecord_bot_exittime',   'bot_id',  'exit_time'),   # per-bot dashboards
+    )
 
     id             = db.Column(db.Integer,   primary_key=True)
     user_id        = db.Column(db.Integer,   db.ForeignKey('users.id'), nullable=False)
@@ -60,13 +89,12 @@ class TradeRecord(db.Model):
     
 
 
-class TradeConfiguration(db.Model):
+class TradeConfiguration(BulkInsertMixin, db.Model):
     __tablename__ = 'trade_configurations'
 
-    id                    = db.Column(db.Integer, primary_key=True)
-    ticket                = db.Column(db.BigInteger, unique=True, index=True, nullable=False)
-    user_id               = db.Column(db.Integer)
-    bot_id                = db.Column(db.String(50))
+    ticket                = db.Column(db.BigInteger, primary_key=True, autoincrement=False)  # MT5 tickets are unique
+    user_id               = db.Column(db.Integer, index=True)
+    bot_id                = db.Column(db.String(50), index=True)
     bot_name              = db.Column(db.String(50))
     strategy              = db.Column(db.String(50))
     magic_number          = db.Column(db.Integer)
@@ -0,0 +1,47 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("MetaTrader5")
+pytest.importorskip("flask_socketio")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import candlestickData  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    deal_calls = []
+
+    def history_deals_get(date_from, date_to):
+        deal_calls.append((date_from, date_to))
+        return []
+
+    monkeypatch.setattr(candlestickData, "is_mt5_connected", lambda: True)
+    monkeypatch.setattr(candlestickData.mt5, "history_deals_get", history_deals_get)
+    monkeypatch.setattr(candlestickData.mt5, "positions_get", lambda: [])
+
+    client = candlestickData.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = 1
+    client.deal_calls = deal_calls
+    return client
+
+
+def test_trade_history_accepts_utc_from(client):
+    from_utc = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+    resp = client.get(f"/trade-history?from={from_utc.strftime('%Y-%m-%dT%H:%M:%SZ')}")
+
+    assert resp.status_code == 200
+    assert resp.get_json() == []
+    date_from, date_to = client.deal_calls[0]
+    assert date_from.tzinfo is None and date_to.tzinfo is None
+    assert date_from == from_utc.astimezone().replace(tzinfo=None) - timedelta(days=7)
+
+
+def test_parse_iso_local_keeps_naive_values():
+    assert candlestickData._parse_iso_local("2026-01-02T03:04:05") == datetime(2026, 1, 2, 3, 4, 5)
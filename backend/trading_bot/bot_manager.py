@@ -1,27 +1,96 @@
 """
 Trading Bot Manager - Controls bot operations and integrates with the main application
 """
+import heapq
 import logging
 import threading
 import time
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional, Callable
+from operator import itemgetter
+from typing import Dict, List, Optional, Callable, Tuple
 import MetaTrader5 as mt5
+import numpy as np
 from .strategies import get_strategy, list_strategies
+from . import indicators
 
 log = logging.getLogger(__name__)
 
+# Process-wide attribution maps, maintained on bot lifecycle events so request
+# handlers can attribute trades with a dict lookup instead of scanning managers.
+GLOBAL_BOT_MAGIC_MAP: Dict[int, Dict] = {}   # magic number -> bot info
+GLOBAL_BOT_POSITION_MAP: Dict[int, Dict] = {}  # position_id of a completed trade -> bot info
+_bot_map_lock = threading.Lock()
+
+# symbol -> last type_filling the broker accepted; supported filling modes are a
+# static property of the symbol/account, so every bot can start with it
+_filling_mode_cache: Dict[str, int] = {}
+
+# Candle window handed to strategies, and the backing buffer it slides through
+RATES_WINDOW = 100
+RATES_BUFFER_SIZE = 512
+
+# Per-bot deal cache bounds for _update_performance: the newest deals kept as
+# dicts (the dashboard lists at most the 50 latest trades), and the positions kept
+# individually before the oldest are folded into the running session totals
+DEAL_CACHE_LIMIT = 50
+POSITION_CACHE_LIMIT = 50
+
+# Config keys recorded with every executed trade (persisted as TradeConfiguration)
+CONFIG_SNAPSHOT_FIELDS = (
+    'max_risk_per_trade', 'trade_size_usd', 'leverage', 'asset_type',
+    'risk_reward_ratio', 'stop_loss_pips', 'take_profit_pips', 'max_loss_threshold',
+    'entry_trigger', 'exit_trigger', 'max_daily_trades', 'time_window',
+    'rsi_period', 'moving_average_period', 'bollinger_bands_period', 'bb_deviation',
+    'auto_stop_enabled', 'max_consecutive_losses', 'auto_trading_enabled',
+)
+
+def _add_to_position(positions: Dict[int, list], trade: Dict):
+    """Fold a deal into positions[position_id] = [total_profit, deal_count, last_deal]"""
+    entry = positions.get(trade['position_id'])
+    if entry is None:
+        positions[trade['position_id']] = [trade['profit'], 1, trade]
+        return
+    entry[0] += trade['profit']
+    entry[1] += 1
+    if trade['time'] > entry[2]['time']:  # the latest deal is the close
+        entry[2] = trade
+
+def _new_session_totals() -> Dict:
+    """Running session totals for completed positions, in close order"""
+    return {'trades': 0, 'wins': 0, 'losses': 0, 'running_pnl': 0, 'peak': 0, 'max_drawdown': 0}
+
+def bot_display_name(bot_id: str) -> str:
+    """Human readable bot name, e.g. 'bot_3' -> 'Bot 3'"""
+    return f"Bot {bot_id.split('_')[-1] if '_' in bot_id else bot_id}"
+
 class TradingBotManager:
     def __init__(self, mt5_symbol="ETHUSD"):
         self.symbol = mt5_symbol
         self.is_running = False
         self.strategies = {}
-        self.active_trades = {}
+        self._strategies_cache: Optional[Tuple[str, ...]] = None  # see get_available_strategies()
+        self.active_trades: Dict[int, Dict] = {}  # mt5 ticket -> open trade this bot placed
         self.bot_thread = None
-        self.update_callbacks = []
+        self._stop_event = threading.Event()  # wakes the bot loop immediately on stop
+        self._config_lock = threading.Lock()  # serializes config writers; readers take self.config as-is
+        self._latest_update = None  # newest periodic bot_update, delivered by flush_latest_update()
+        self.update_callbacks: tuple = ()  # immutable; rebound on registration
         self.bot_id = None  # Track which bot this manager belongs to
         self.unique_magic_number = None  # Unique magic number for this bot instance
         self.bot_start_time = None  # When this bot instance started
+        self.owner_user_id = None  # User who started the bot, when known
+        self._last_deal_time = None  # history_deals_get lower bound: bot start, then newest deal time seen
+        self._cached_bot_trades: List[Dict] = []  # this bot's newest deals (DEAL_CACHE_LIMIT), oldest first
+        self._cached_deal_tickets = set()  # tickets of the deals at _last_deal_time, which the next fetch returns again
+        self._cached_positions: Dict[int, list] = {}  # position_id -> [total_profit, deal_count, last_deal], newest positions
+        self._session_base = _new_session_totals()  # completed positions folded out of _cached_positions
+        self._symbol_cache: Dict[str, tuple] = {}  # symbol -> (point, pip_size, min_distance, stops_level)
+        self._strategy_cache = (None, None)  # (strategy_name, strategy instance)
+        self._snapshot_cache = (None, None)  # (config dict, its CONFIG_SNAPSHOT_FIELDS subset)
+        self._rates_buf = None  # M1 candles, same dtype as mt5 rates
+        self._rates_end = 0     # window is _rates_buf[_rates_end - RATES_WINDOW:_rates_end]
+        indicators.warmup()  # compile indicator kernels now rather than on the first tick
         
         # PERSISTENT performance tracking - survives trade closures
         self.lifetime_stats = {
@@ -32,10 +101,12 @@ class TradingBotManager:
             'lifetime_max_drawdown': 0.0,
             'peak_balance': 0.0,
             'completed_trade_history': [],  # Store completed trades
+            'tracked_tickets': set(),  # tickets in completed_trade_history, for O(1) membership tests
             'daily_stats': {}  # Track daily performance
         }
         
-        # Bot configuration
+        # Bot configuration. Copy-on-write: writers rebind a new dict, so a
+        # reference taken by the bot loop is a stable snapshot.
         self.config = {
             'max_risk_per_trade': 0.02,  # 2% risk per trade
             'max_daily_trades': 10,
@@ -62,7 +133,9 @@ class TradingBotManager:
         
     def register_update_callback(self, callback: Callable):
         """Register callback for bot status updates"""
-        self.update_callbacks.append(callback)
+        # Rebinding the attribute is atomic, so notify_updates can iterate
+        # its snapshot without a lock or a defensive copy
+        self.update_callbacks = self.update_callbacks + (callback,)
         
     def notify_updates(self, data: Dict):
         """Notify all registered callbacks about bot updates"""
@@ -72,19 +145,39 @@ class TradingBotManager:
             except Exception as e:
                 log.error(f"Error in update callback: {e}")
     
+    def publish_latest_update(self, data: Dict):
+        """Stash a periodic update; a newer one replaces it if it hasn't been flushed yet"""
+        self._latest_update = data
+        
+    def flush_latest_update(self):
+        """Deliver the pending periodic update, if any, to the registered callbacks"""
+        data, self._latest_update = self._latest_update, None
+        if data is not None:
+            self.notify_updates(data)
+        
     def start_bot(self, strategy_name: str = "default", bot_id: str = None):
         """Start the trading bot"""
         if self.is_running:
             log.warning("Bot is already running")
             return False
             
+        if self.bot_thread is not None:
+            if self.bot_thread.is_alive():
+                log.error(f"❌ Previous loop for bot {self.bot_id} is still running; refusing to start another")
+                return False
+            self.bot_thread = None
+            
         if not mt5.initialize():
             log.error("Failed to initialize MT5 for bot")
             return False
             
         log.info(f"Starting trading bot with strategy: {strategy_name}")
         self.is_running = True
-        self.config['strategy_name'] = strategy_name
+        with self._config_lock:
+            self.config = {**self.config, 'strategy_name': strategy_name}
+        self._strategy_cache = (strategy_name, get_strategy(strategy_name, self.symbol))
+        self._symbol_cache.clear()  # pick up broker changes (e.g. stops level) on each start
+        self._symbol_params()       # and fetch them now rather than on the first signal
         self.bot_id = bot_id  # Store bot ID
         
         # Generate unique magic number for this bot instance
@@ -92,6 +185,14 @@ class TradingBotManager:
         
         # Set bot start time for tracking purposes
         self.bot_start_time = datetime.now()
+        self._last_deal_time = self.bot_start_time
+        self._cached_bot_trades = []
+        self._cached_deal_tickets = set()
+        self._cached_positions = {}
+        self._session_base = _new_session_totals()
+        
+        # Publish magic -> bot mapping for trade attribution
+        self._register_attribution()
         
         # Reset performance metrics for this new bot instance
         self.performance = {
@@ -114,6 +215,7 @@ class TradingBotManager:
         log.info(f"Bot {self.bot_id} assigned magic number: {self.unique_magic_number}")
         
         # Start bot in separate thread
+        self._stop_event.clear()
         self.bot_thread = threading.Thread(target=self._bot_loop, daemon=True)
         self.bot_thread.start()
         
@@ -138,9 +240,20 @@ class TradingBotManager:
             
         log.info("Stopping trading bot...")
         self.is_running = False
+        self._stop_event.set()
         
         if self.bot_thread and self.bot_thread.is_alive():
             self.bot_thread.join(timeout=5)
+        if self.bot_thread and self.bot_thread.is_alive():
+            # Keep the reference so start_bot() won't run a second loop alongside it
+            log.error(f"❌ Bot {self.bot_id} loop did not exit within 5s; it will stop after its current step")
+        else:
+            self.bot_thread = None
+        
+        self._unregister_attribution()
+        
+        # Deliver the last periodic update before the 'stopped' status
+        self.flush_latest_update()
             
         # Notify frontend about bot stop
         self.notify_updates({
@@ -158,23 +271,42 @@ class TradingBotManager:
         log.info(f"🔧 Initial Bot Config: auto_trading={self.config['auto_trading_enabled']}, strategy={self.config['strategy_name']}")
         
         last_trade_minute = 0  # Track the last minute when trade was attempted
-        last_performance_update = 0  # Track last performance update
+        last_performance_update = float('-inf')  # monotonic time of the last performance update
+        next_tick = time.monotonic()  # Deadline of the next 1-second tick
+        last_tick_msc = None  # time_msc of the last tick we acted on
+        last_bid = None  # bid in the last published bot_update
+        
+        # Bind what the loop touches every tick to locals once; config is
+        # deliberately not captured since update_config() can change it while running
+        symbol = self.symbol
+        symbol_info_tick = mt5.symbol_info_tick
+        monotonic = time.monotonic
+        wall_time = time.time
+        wait = self._stop_event.wait
+        publish = self.publish_latest_update
         
         while self.is_running:
             try:
+                cfg = self.config  # stable snapshot for this tick
+                
                 # Get current market data
-                current_tick = mt5.symbol_info_tick(self.symbol)
+                current_tick = symbol_info_tick(symbol)
                 if not current_tick:
-                    log.warning(f"No tick data for {self.symbol}")
-                    time.sleep(1)
+                    log.warning(f"No tick data for {symbol}")
+                    wait(1)
+                    next_tick = monotonic()
                     continue
                 
-                # Get current minute to control trade frequency
-                current_time = time.time()
+                # Wall-clock minute controls trade frequency (analysis is aligned to minute bars)
+                current_time = wall_time()
                 current_minute = int(current_time // 60)  # Convert to minute intervals
                 
+                # Nothing to analyze or report if the market hasn't ticked since last time
+                fresh_tick = current_tick.time_msc != last_tick_msc
+                last_tick_msc = current_tick.time_msc
+                
                 # Only analyze and potentially trade once per minute
-                should_analyze = current_minute > last_trade_minute
+                should_analyze = fresh_tick and current_minute > last_trade_minute
                 
                 if should_analyze:
                     # Check for trading signals
@@ -183,7 +315,7 @@ class TradingBotManager:
                     # Log signal analysis for debugging
                     if signal:
                         log.info(f"🎯 SIGNAL GENERATED: {signal['type']} at {signal['price']} - {signal.get('reason', 'No reason')}")
-                        if self.config['auto_trading_enabled']:
+                        if cfg['auto_trading_enabled']:
                             log.info("✅ Auto trading enabled - executing trade")
                             self._execute_trade(signal)
                             last_trade_minute = current_minute  # Update last trade minute
@@ -196,32 +328,45 @@ class TradingBotManager:
                             last_trade_minute = current_minute  # Still update to avoid spam
                     else:
                         # Log once per minute when no signal
-                        log.info(f"📊 No signal generated at minute {current_minute} - auto_trading: {self.config['auto_trading_enabled']}")
+                        log.info("📊 No signal generated at minute %s - auto_trading: %s", current_minute, cfg['auto_trading_enabled'])
                         last_trade_minute = current_minute
                 
                 # Update performance metrics more frequently (every 10 seconds instead of every minute)
                 performance_update_interval = 10  # seconds
-                if current_time - last_performance_update >= performance_update_interval:
-                    self._update_performance()
-                    last_performance_update = current_time
+                now_mono = monotonic()  # interval timing must not follow wall-clock steps
+                performance_updated = now_mono - last_performance_update >= performance_update_interval
+                if performance_updated:
+                    self._update_performance(datetime.fromtimestamp(current_time))
+                    last_performance_update = now_mono
                 
-                # Always notify frontend with updates (for responsive UI)
-                self.notify_updates({
-                    'type': 'bot_update',
-                    'bot_id': self.bot_id,
-                    'current_price': current_tick.bid,
-                    'signal': signal if should_analyze else None,
-                    'performance': self.performance,  # Always include complete performance data
-                    'active_trades': self.performance.get('active_trades', 0),  # Use performance data
-                    'timestamp': datetime.now().isoformat(),
-                    'next_analysis_in': 60 - int(current_time % 60)  # Seconds until next analysis
-                })
+                # Periodic UI refresh; coalesced and fanned out by the app's broadcaster.
+                # Only worth sending when the displayed price, a signal or the performance moved.
+                if current_tick.bid != last_bid or should_analyze or performance_updated:
+                    last_bid = current_tick.bid
+                    publish({
+                        'type': 'bot_update',
+                        'bot_id': self.bot_id,
+                        'current_price': current_tick.bid,
+                        'signal': signal if should_analyze else None,
+                        'performance': self.performance,  # Always include complete performance data
+                        'active_trades': self.performance.get('active_trades', 0),  # Use performance data
+                        'timestamp': int(current_time * 1000),  # epoch ms; the UI passes it to new Date()
+                        'next_analysis_in': 60 - int(current_time % 60)  # Seconds until next analysis
+                    })
                 
-                time.sleep(1)  # Keep 1-second loop for responsive UI updates
+                # Keep 1-second loop for responsive UI updates; sleep to the next
+                # deadline so time spent in MT5 calls doesn't stretch the tick
+                next_tick += 1
+                delay = next_tick - monotonic()
+                if delay <= 0:
+                    next_tick = monotonic()
+                    delay = 0
+                wait(delay)
                 
             except Exception as e:
                 log.error(f"❌ Error in bot loop: {e}")
-                time.sleep(5)
+                wait(5)
+                next_tick = monotonic()
                 
         log.info("🤖 Bot loop ended")
         
@@ -229,22 +374,27 @@ class TradingBotManager:
         """Analyze market conditions and generate trading signals"""
         try:
             # Get recent candle data
-            rates = mt5.copy_rates_from_pos(self.symbol, mt5.TIMEFRAME_M1, 0, 100)
+            rates = self._get_rates()
             if rates is None or len(rates) < 50:
                 log.warning(f"⚠️ Insufficient candle data: {len(rates) if rates is not None else 0} candles (need 50+)")
                 return None
             
-            # Get the current strategy
-            strategy = get_strategy(self.config['strategy_name'], self.symbol)
-            log.info(f"📈 Using strategy: {strategy.name} for {self.config['strategy_name']} with {len(rates)} candles")
+            # Get the current strategy, rebuilt only when the configured name changes
+            strategy_name = self.config['strategy_name']
+            if self._strategy_cache[0] != strategy_name:
+                self._strategy_cache = (strategy_name, get_strategy(strategy_name, self.symbol))
+            strategy = self._strategy_cache[1]
+            if log.isEnabledFor(logging.INFO):
+                log.info("📈 Using strategy: %s for %s with %d candles", strategy.name, strategy_name, len(rates))
             
             # Analyze using the selected strategy
             signal = strategy.analyze(rates)
             
             if signal:
-                log.info(f"🎯 Strategy {strategy.name} generated signal: {signal}")
-            else:
-                log.debug(f"📊 Strategy {strategy.name} - no signal")
+                if log.isEnabledFor(logging.INFO):
+                    log.info("🎯 Strategy %s generated signal: %s", strategy.name, signal)
+            elif log.isEnabledFor(logging.DEBUG):
+                log.debug("📊 Strategy %s - no signal", strategy.name)
             
             return signal
             
@@ -252,9 +402,45 @@ class TradingBotManager:
             log.error(f"❌ Error in market analysis: {e}")
             return None
             
+    def _get_rates(self):
+        """
+        Return the last RATES_WINDOW M1 candles. After the first full fetch only
+        the two newest bars are requested each tick and merged into a rolling
+        buffer; a full refetch happens whenever the bars don't line up.
+        """
+        buf, end = self._rates_buf, self._rates_end
+        if buf is not None:
+            latest = mt5.copy_rates_from_pos(self.symbol, mt5.TIMEFRAME_M1, 0, 2)
+            if latest is not None and len(latest) == 2:
+                last_time = buf['time'][end - 1]
+                if latest['time'][1] == last_time:
+                    # Same bar still forming
+                    buf[end - 1] = latest[1]
+                    return buf[end - RATES_WINDOW:end]
+                if latest['time'][0] == last_time:
+                    # A new bar opened: finalize the previous one and append
+                    buf[end - 1] = latest[0]
+                    if end == len(buf):
+                        buf[:RATES_WINDOW - 1] = buf[end - RATES_WINDOW + 1:end]
+                        end = RATES_WINDOW - 1
+                    buf[end] = latest[1]
+                    self._rates_end = end + 1
+                    return buf[end + 1 - RATES_WINDOW:end + 1]
+
+        rates = mt5.copy_rates_from_pos(self.symbol, mt5.TIMEFRAME_M1, 0, RATES_WINDOW)
+        if rates is None or len(rates) < RATES_WINDOW:
+            self._rates_buf = None
+            return rates
+        if buf is None or buf.dtype != rates.dtype:
+            buf = self._rates_buf = np.empty(RATES_BUFFER_SIZE, dtype=rates.dtype)
+        buf[:RATES_WINDOW] = rates
+        self._rates_end = RATES_WINDOW
+        return buf[:RATES_WINDOW]
+            
     def _execute_trade(self, signal: Dict):
         """Execute a trade based on the signal"""
-        if not self.config['auto_trading_enabled']:
+        cfg = self.config  # stable snapshot for this trade
+        if not cfg['auto_trading_enabled']:
             log.info(f"Auto trading disabled, signal: {signal}")
             return
             
@@ -271,12 +457,12 @@ class TradingBotManager:
             log.info(f"💰 Account balance: ${account_balance}")
             
             # Calculate risk amount
-            risk_amount = account_balance * (self.config['max_risk_per_trade'] / 100.0)
+            risk_amount = account_balance * (cfg['max_risk_per_trade'] / 100.0)
             log.info(f"💸 Risk amount: ${risk_amount}")
             
             # Get symbol info for pip value calculation
-            symbol_info = mt5.symbol_info(self.symbol)
-            if symbol_info is None:
+            symbol_params = self._symbol_params()
+            if symbol_params is None:
                 log.error(f"❌ Failed to get symbol info for {self.symbol}")
                 return
                 
@@ -291,12 +477,12 @@ class TradingBotManager:
                 # Risk-based calculation but capped
                 price_per_lot = signal['price']  # For ETHUSD, 1 lot = price in USD
                 max_lots_by_balance = account_balance * 0.02 / price_per_lot  # Max 2% of balance
-                risk_lots = risk_amount / (self.config['stop_loss_pips'] * 0.1)  # Assuming $0.1 per pip
+                risk_lots = risk_amount / (cfg['stop_loss_pips'] * 0.1)  # Assuming $0.1 per pip
                 lot_size = min(max_lots_by_balance, risk_lots, 1.0)  # Cap at 1 lot max
                 
             # Ensure minimum lot size and round properly
             lot_size = max(0.01, round(lot_size, 2))
-            log.info(f"📊 Calculated lot size: {lot_size} (Balance: ${account_balance}, Risk: {self.config['max_risk_per_trade']}%)")
+            log.info(f"📊 Calculated lot size: {lot_size} (Balance: ${account_balance}, Risk: {cfg['max_risk_per_trade']}%)")
 
             # Determine order type and get current price
             order_type = mt5.ORDER_TYPE_BUY if signal['type'] == 'BUY' else mt5.ORDER_TYPE_SELL
@@ -312,17 +498,16 @@ class TradingBotManager:
 
             # Calculate stop loss and take profit prices
             # For ETHUSD, 1 pip = 0.01, so we need to multiply by 10 * point
-            pip_size = 10 * symbol_info.point  # Correct pip calculation for ETHUSD
-            min_distance = max(20 * pip_size, symbol_info.trade_stops_level * symbol_info.point)  # Minimum 20 pips or broker requirement
+            point, pip_size, min_distance, stops_level = symbol_params
             
             if signal['type'] == 'BUY':
-                sl_price = current_price - max(self.config['stop_loss_pips'] * pip_size, min_distance) if self.config['stop_loss_pips'] > 0 else 0
-                tp_price = current_price + max(self.config['take_profit_pips'] * pip_size, min_distance) if self.config['take_profit_pips'] > 0 else 0
+                sl_price = current_price - max(cfg['stop_loss_pips'] * pip_size, min_distance) if cfg['stop_loss_pips'] > 0 else 0
+                tp_price = current_price + max(cfg['take_profit_pips'] * pip_size, min_distance) if cfg['take_profit_pips'] > 0 else 0
             else:  # SELL
-                sl_price = current_price + max(self.config['stop_loss_pips'] * pip_size, min_distance) if self.config['stop_loss_pips'] > 0 else 0
-                tp_price = current_price - max(self.config['take_profit_pips'] * pip_size, min_distance) if self.config['take_profit_pips'] > 0 else 0
+                sl_price = current_price + max(cfg['stop_loss_pips'] * pip_size, min_distance) if cfg['stop_loss_pips'] > 0 else 0
+                tp_price = current_price - max(cfg['take_profit_pips'] * pip_size, min_distance) if cfg['take_profit_pips'] > 0 else 0
             
-            log.info(f"📊 Pip calculation: pip_size={pip_size}, min_distance={min_distance}, stops_level={symbol_info.trade_stops_level}")
+            log.info(f"📊 Pip calculation: pip_size={pip_size}, min_distance={min_distance}, stops_level={stops_level}")
 
             # Prepare the trade request with safe comment and unique magic number
             safe_comment = f"TradePulse_{self.bot_id}_{signal['type']}"[:31]  # MT5 comment limit is 31 chars
@@ -333,6 +518,11 @@ class TradingBotManager:
                 mt5.ORDER_FILLING_IOC,     # Immediate or Cancel
                 mt5.ORDER_FILLING_FOK      # Fill or Kill
             ]
+            cached_filling = _filling_mode_cache.get(self.symbol)
+            if cached_filling in filling_modes:
+                # Known-good mode first; the rest remain as fallbacks on 10030
+                filling_modes.remove(cached_filling)
+                filling_modes.insert(0, cached_filling)
 
             # Try with SL/TP first, then without if it fails
             sl_tp_configs = [
@@ -340,22 +530,33 @@ class TradingBotManager:
                 {'description': 'without SL/TP (market order only)'}  # No sl/tp keys at all
             ]
 
+            # Base request, built once; each attempt only rewrites the fields that vary
+            request = {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": self.symbol,
+                "volume": lot_size,
+                "type": order_type,
+                "price": current_price,
+                "deviation": 20,
+                "magic": self.unique_magic_number,  # Use bot-specific magic number
+                "comment": safe_comment,
+                "type_time": mt5.ORDER_TIME_GTC,
+            }
+            info_enabled = log.isEnabledFor(logging.INFO)
+            
+            if cached_filling is None:
+                # First trade on this symbol: rank the filling modes with order_check
+                # (validated by the terminal, nothing reaches the broker) so that real
+                # order_send attempts start with a mode that is known to be accepted
+                filling_modes = self._rank_filling_modes(request, filling_modes, sl_price, tp_price)
+
             result = None
             for sl_tp_config in sl_tp_configs:
                 for filling_mode in filling_modes:
-                    # Base request
-                    request = {
-                        "action": mt5.TRADE_ACTION_DEAL,
-                        "symbol": self.symbol,
-                        "volume": lot_size,
-                        "type": order_type,
-                        "price": current_price,
-                        "deviation": 20,
-                        "magic": self.unique_magic_number,  # Use bot-specific magic number
-                        "comment": safe_comment,
-                        "type_time": mt5.ORDER_TIME_GTC,
-                        "type_filling": filling_mode,
-                    }
+                    request['type_filling'] = filling_mode
+                    request['volume'] = lot_size  # may have been reduced by a 'no money' retry
+                    request.pop('sl', None)
+                    request.pop('tp', None)
                     
                     # Add SL/TP only if they exist in config and are > 0
                     if 'sl' in sl_tp_config and sl_tp_config['sl'] > 0:
@@ -363,8 +564,10 @@ class TradingBotManager:
                     if 'tp' in sl_tp_config and sl_tp_config['tp'] > 0:
                         request['tp'] = sl_tp_config['tp']
                     
-                    log.info(f"📤 Trying order {sl_tp_config['description']} with filling mode {filling_mode}: {signal['type']} {lot_size} {self.symbol} at {current_price}")
-                    log.info(f"📋 Order request: {request}")
+                    if info_enabled:
+                        log.info("📤 Trying order %s with filling mode %s: %s %s %s at %s",
+                                 sl_tp_config['description'], filling_mode, signal['type'], lot_size, self.symbol, current_price)
+                        log.info("📋 Order request: %s", request)
                     
                     # Send the trade request
                     result = mt5.order_send(request)
@@ -377,6 +580,7 @@ class TradingBotManager:
                     # Check if order was successful
                     if result.retcode == mt5.TRADE_RETCODE_DONE:
                         # SUCCESS!
+                        _filling_mode_cache[self.symbol] = filling_mode
                         log.info(f"✅ SUCCESS! Order executed {sl_tp_config['description']} with filling mode {filling_mode}")
                         log.info(f"✅ Order executed successfully! Ticket: {result.order}, Volume: {result.volume}, Price: {result.price}")
                         break
@@ -413,16 +617,7 @@ class TradingBotManager:
             
             # Order successful - track it
             trade_id = f"trade_{result.order}"
-            self.active_trades[trade_id] = {
-                'signal': signal,
-                'entry_time': datetime.now(),
-                'status': 'active',
-                'mt5_ticket': result.order,
-                'lot_size': lot_size,
-                'entry_price': signal['price'],
-                'sl': sl_price,
-                'tp': tp_price
-            }
+            self._add_active_trade(result.order, signal['price'], lot_size, sl_price, tp_price)
             
             # IMMEDIATELY update performance after successful trade
             log.info(f"✅ Trade completed! Ticket: {result.order}, Volume: {result.volume}, Price: {result.price}")
@@ -442,33 +637,10 @@ class TradingBotManager:
                 'sl': sl_price,
                 'tp': tp_price,
                 # 'performance': self.performance,  # Include updated performance
-                'strategy': self.config.get('strategy_name'),
+                'strategy': cfg.get('strategy_name'),
                 'magic_number': self.unique_magic_number,
-                'user_id': getattr(self, 'owner_user_id', None),   # set when starting bot (see below)
-                'config_snapshot': {
-                    'max_risk_per_trade': self.config.get('max_risk_per_trade'),
-                    'trade_size_usd':     self.config.get('trade_size_usd'),
-                    'leverage':           self.config.get('leverage'),
-                    'asset_type':         self.config.get('asset_type'),
-
-                    'risk_reward_ratio':  self.config.get('risk_reward_ratio'),
-                    'stop_loss_pips':     self.config.get('stop_loss_pips'),
-                    'take_profit_pips':   self.config.get('take_profit_pips'),
-                    'max_loss_threshold': self.config.get('max_loss_threshold'),
-
-                    'entry_trigger':      self.config.get('entry_trigger'),
-                    'exit_trigger':       self.config.get('exit_trigger'),
-                    'max_daily_trades':   self.config.get('max_daily_trades'),
-                    'time_window':        self.config.get('time_window'),
-
-                    'rsi_period':             self.config.get('rsi_period'),
-                    'moving_average_period':  self.config.get('moving_average_period'),
-                    'bollinger_bands_period': self.config.get('bollinger_bands_period'),
-                    'bb_deviation':           self.config.get('bb_deviation'),
-
-                    'auto_stop_enabled':      self.config.get('auto_stop_enabled'),
-                    'max_consecutive_losses': self.config.get('max_consecutive_losses'),
-                    'auto_trading_enabled':   self.config.get('auto_trading_enabled'),},
+                'user_id': self.owner_user_id,
+                'config_snapshot': self._config_snapshot(cfg),
                 'timestamp': datetime.now().isoformat()
             })
             
@@ -476,6 +648,88 @@ class TradingBotManager:
             log.error(f"Error executing trade: {e}")
             self._notify_trade_error("Trade execution error", str(e))
             
+    def _symbol_params(self):
+        """
+        (point, pip_size, min_distance, stops_level) for self.symbol, fetched from
+        MT5 once and cached; None if the terminal doesn't know the symbol.
+        """
+        params = self._symbol_cache.get(self.symbol)
+        if params is None:
+            symbol_info = mt5.symbol_info(self.symbol)
+            if symbol_info is None:
+                return None
+            point = symbol_info.point
+            pip_size = 10 * point  # Correct pip calculation for ETHUSD
+            min_distance = max(20 * pip_size, symbol_info.trade_stops_level * point)  # Minimum 20 pips or broker requirement
+            params = self._symbol_cache[self.symbol] = (point, pip_size, min_distance, symbol_info.trade_stops_level)
+        return params
+        
+    def _rank_filling_modes(self, request: Dict, filling_modes: List[int], sl_price: float, tp_price: float) -> List[int]:
+        """Filling modes that pass mt5.order_check first, the others after as fallbacks"""
+        check_request = dict(request)
+        if sl_price > 0:
+            check_request['sl'] = sl_price
+        if tp_price > 0:
+            check_request['tp'] = tp_price
+        passed, failed = [], []
+        for filling_mode in filling_modes:
+            check_request['type_filling'] = filling_mode
+            try:
+                check = mt5.order_check(check_request)
+            except Exception as e:
+                log.warning(f"⚠️ order_check failed for filling mode {filling_mode}: {e}")
+                check = None
+            if check is not None and check.retcode == 0:
+                passed.append(filling_mode)
+            else:
+                failed.append(filling_mode)
+        if passed:
+            log.info(f"🔍 order_check accepted filling modes {passed} for {self.symbol}")
+        return passed + failed
+        
+    def _prune_deal_cache(self):
+        """
+        Keep the deal cache bounded: drop all but the newest DEAL_CACHE_LIMIT deals and
+        fold the oldest positions beyond POSITION_CACHE_LIMIT into _session_base
+        """
+        del self._cached_bot_trades[:-DEAL_CACHE_LIMIT]
+        positions = self._cached_positions
+        base = self._session_base
+        while len(positions) > POSITION_CACHE_LIMIT:
+            total_profit, deal_count, _ = positions.pop(next(iter(positions)))
+            if deal_count < 2 and total_profit == 0:
+                continue  # still open; its closing deal will start a new entry
+            base['trades'] += 1
+            if total_profit > 0:
+                base['wins'] += 1
+            elif total_profit < 0:
+                base['losses'] += 1
+            base['running_pnl'] += total_profit
+            if base['running_pnl'] > base['peak']:
+                base['peak'] = base['running_pnl']
+            drawdown = base['peak'] - base['running_pnl']
+            if drawdown > base['max_drawdown']:
+                base['max_drawdown'] = drawdown
+        
+    def _add_active_trade(self, ticket, entry_price, lot_size, sl, tp):
+        """Record a trade this bot just opened"""
+        self.active_trades[ticket] = {
+            'entry_time': datetime.now(),
+            'status': 'active',
+            'mt5_ticket': ticket,
+            'lot_size': lot_size,
+            'entry_price': entry_price,
+            'sl': sl,
+            'tp': tp
+        }
+        
+    def _close_active_trade(self, ticket):
+        """Forget a trade once it has closed (no-op for tickets this bot didn't open)"""
+        self.active_trades.pop(ticket, None)
+            
+    def _active_trade_count(self) -> int:
+        return len(self.active_trades)
+        
     def _notify_trade_error(self, error_type: str, details: str):
         """Notify frontend about trade execution errors"""
         self.notify_updates({
@@ -486,21 +740,27 @@ class TradingBotManager:
             'timestamp': datetime.now().isoformat()
         })
             
-    def _update_performance(self):
+    def _update_performance(self, now: Optional[datetime] = None):
         """Update bot performance metrics based on ONLY this bot's trades"""
+        now = now or datetime.now()
+        now_iso = now.isoformat()
         try:
             # Skip if bot hasn't been properly initialized
             if not self.unique_magic_number or not self.bot_start_time:
-                log.debug(f"Bot {self.bot_id} not fully initialized for performance tracking")
-                return
-                
-            # Get actual account info
-            if not mt5.initialize():
-                log.warning("MT5 not initialized for performance update")
+                log.debug("Bot %s not fully initialized for performance tracking", self.bot_id)
                 return
                 
-            # Get account info for general data
+            # start_bot() already initialized MT5; only re-initialize when the
+            # terminal connection has dropped (account_info() returns None)
             account_info = mt5.account_info()
+            if account_info is None:
+                log.warning(f"MT5 call failed for bot {self.bot_id} ({mt5.last_error()}), re-initializing")
+                if not mt5.initialize():
+                    log.warning("MT5 not initialized for performance update")
+                    return
+                account_info = mt5.account_info()
+                
+            # Account info for general data
             if account_info:
                 current_balance = account_info.balance
                 current_equity = account_info.equity
@@ -515,14 +775,28 @@ class TradingBotManager:
             # Get trade history ONLY from when this bot started (not all history)
             from datetime import timedelta
             
-            # Get deals from bot start time to now - this ensures we only get THIS bot's trades
-            deals = mt5.history_deals_get(self.bot_start_time, datetime.now())
-            bot_specific_trades = []
+            # Only fetch deals since the newest one already cached. The lower bound is
+            # inclusive and is the newest deal's own second, so deals sharing that
+            # second are fetched again and skipped by ticket.
+            deals = mt5.history_deals_get(self._last_deal_time, now)
             
-            log.debug(f"Checking deals from {self.bot_start_time} for bot {self.bot_id} with magic {self.unique_magic_number}")
+            debug_enabled = log.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                log.debug("Checking deals from %s for bot %s with magic %s",
+                          self._last_deal_time, self.bot_id, self.unique_magic_number)
             
+            new_bot_trades = []
             if deals:
+                seen_tickets = self._cached_deal_tickets
                 for deal in deals:
+                    deal_time = getattr(deal, 'time', 0)
+                    if isinstance(self._last_deal_time, datetime) or deal_time > self._last_deal_time:
+                        self._last_deal_time = deal_time  # epoch seconds, as MT5 reports them
+                    ticket = getattr(deal, 'ticket', 0)
+                    if ticket in seen_tickets:
+                        continue
+                    seen_tickets.add(ticket)
+                    
                     magic_number = getattr(deal, 'magic', 0)
                     comment = getattr(deal, 'comment', '')
                     deal_type = getattr(deal, 'type', -1)
@@ -540,10 +814,10 @@ class TradingBotManager:
                         swap = getattr(deal, 'swap', 0)
                         net_profit = profit + commission + swap
                         
-                        bot_specific_trades.append({
-                            'ticket': getattr(deal, 'ticket', 0),
+                        bot_trade = {
+                            'ticket': ticket,
                             'position_id': getattr(deal, 'position_id', 0),
-                            'time': datetime.fromtimestamp(getattr(deal, 'time', 0)),
+                            'time': datetime.fromtimestamp(deal_time),
                             'type': 'BUY' if deal_type == 0 else 'SELL',
                             'volume': getattr(deal, 'volume', 0),
                             'price': getattr(deal, 'price', 0),
@@ -553,39 +827,49 @@ class TradingBotManager:
                             'swap': swap,
                             'magic': magic_number,
                             'comment': comment
-                        })
+                        }
+                        new_bot_trades.append(bot_trade)
+                        _add_to_position(self._cached_positions, bot_trade)
                         
-                        log.debug(f"Found bot trade: ticket={getattr(deal, 'ticket', 0)}, "
-                                f"magic={magic_number}, profit={net_profit:.2f}, comment={comment}")
+                        if debug_enabled:
+                            log.debug("Found bot trade: ticket=%s, magic=%s, profit=%.2f, comment=%s",
+                                      ticket, magic_number, net_profit, comment)
+            
+                # Only the deals in the watermark second come back on the next fetch
+                last_deal_time = self._last_deal_time
+                self._cached_deal_tickets = {getattr(deal, 'ticket', 0) for deal in deals
+                                             if getattr(deal, 'time', 0) == last_deal_time}
+                self._cached_bot_trades.extend(new_bot_trades)
+                self._prune_deal_cache()
+            
+            bot_specific_trades = self._cached_bot_trades
             
             # If no bot-specific trades found, try fallback method for recent TradePulse trades
             if len(bot_specific_trades) == 0:
-                log.info(f"No specific trades found for bot {self.bot_id}, trying fallback method...")
+                log.info("No specific trades found for bot %s, trying fallback method...", self.bot_id)
                 fallback_trades = self._find_recent_bot_trades_fallback()
                 if fallback_trades:
                     # Use fallback trades but limit to reasonable number
                     bot_specific_trades = fallback_trades[:10]  # Max 10 recent trades
-                    log.info(f"Using {len(bot_specific_trades)} fallback trades for bot {self.bot_id}")
-            
-            # Detect newly completed trades first
-            self._detect_completed_trades(bot_specific_trades)
-            
-            # Group deals by position_id to count actual completed trades (not individual deals)
-            position_groups = {}
-            for trade in bot_specific_trades:
-                pos_id = trade['position_id']
-                if pos_id not in position_groups:
-                    position_groups[pos_id] = []
-                position_groups[pos_id].append(trade)
+                    log.info("Using %s fallback trades for bot %s", len(bot_specific_trades), self.bot_id)
+            
+            # Per-position totals: kept up to date as deals are cached, rebuilt only for fallback trades
+            if bot_specific_trades is self._cached_bot_trades:
+                # Cached deals were checked when they arrived; only this fetch's can be new
+                self._detect_completed_trades(new_bot_trades)
+                positions = self._cached_positions
+                base = self._session_base
+            else:
+                self._detect_completed_trades(bot_specific_trades)
+                positions = {}
+                for trade in bot_specific_trades:
+                    _add_to_position(positions, trade)
+                base = _new_session_totals()
             
-            # Calculate metrics from completed positions
+            # Completed positions: opened and closed (2+ deals), or a single deal with profit/loss
             completed_trades = []
-            for pos_id, trades in position_groups.items():
-                if len(trades) >= 2:  # Position opened and closed
-                    # Calculate total profit for this position
-                    total_profit = sum(t['profit'] for t in trades)
-                    # Use the last trade for timing (close)
-                    last_trade = max(trades, key=lambda x: x['time'])
+            for pos_id, (total_profit, deal_count, last_trade) in positions.items():
+                if deal_count >= 2 or total_profit != 0:
                     completed_trades.append({
                         'position_id': pos_id,
                         'profit': total_profit,
@@ -594,29 +878,40 @@ class TradingBotManager:
                         'volume': last_trade['volume'],
                         'price': last_trade['price']
                     })
-                elif len(trades) == 1:
-                    # Single deal - might be a closing deal or instant execution
-                    trade = trades[0]
-                    if trade['profit'] != 0:  # Has profit/loss, so it's a completed trade
-                        completed_trades.append({
-                            'position_id': pos_id,
-                            'profit': trade['profit'],
-                            'time': trade['time'],
-                            'type': trade['type'],
-                            'volume': trade['volume'],
-                            'price': trade['price']
-                        })
+            
+            # Session wins/losses, profit and max drawdown in one pass over the trades in time
+            # order, continuing from the totals of the positions already folded out of the cache
+            completed_trades.sort(key=itemgetter('time'))
+            session_trade_count = base['trades'] + len(completed_trades)
+            session_wins = base['wins']
+            session_losses = base['losses']
+            session_running_pnl = base['running_pnl']
+            session_peak = base['peak']
+            session_max_drawdown = base['max_drawdown']
+            
+            for trade in completed_trades:
+                profit = trade['profit']
+                if profit > 0:
+                    session_wins += 1
+                elif profit < 0:
+                    session_losses += 1
+                session_running_pnl += profit
+                if session_running_pnl > session_peak:
+                    session_peak = session_running_pnl
+                drawdown = session_peak - session_running_pnl
+                if drawdown > session_max_drawdown:
+                    session_max_drawdown = drawdown
+            session_profit = session_running_pnl
             
             # COMBINE lifetime stats with current session stats for complete picture
-            total_trades = self.lifetime_stats['total_completed_trades'] + len(completed_trades)
-            winning_trades = self.lifetime_stats['total_winning_trades'] + len([t for t in completed_trades if t['profit'] > 0])
-            losing_trades = self.lifetime_stats['total_losing_trades'] + len([t for t in completed_trades if t['profit'] < 0])
-            session_profit = sum(t['profit'] for t in completed_trades)
+            total_trades = self.lifetime_stats['total_completed_trades'] + session_trade_count
+            winning_trades = self.lifetime_stats['total_winning_trades'] + session_wins
+            losing_trades = self.lifetime_stats['total_losing_trades'] + session_losses
             total_realized_profit = self.lifetime_stats['lifetime_realized_profit'] + session_profit
             win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
             
             # Calculate daily P&L (from lifetime stats for today)
-            today = datetime.now().strftime('%Y-%m-%d')
+            today = now.strftime('%Y-%m-%d')
             daily_pnl = 0.0
             if today in self.lifetime_stats['daily_stats']:
                 daily_pnl = self.lifetime_stats['daily_stats'][today]['profit']
@@ -624,19 +919,7 @@ class TradingBotManager:
             # Add session profit to daily P&L
             daily_pnl += session_profit
             
-            # Calculate max drawdown (combine lifetime and session)
-            session_running_pnl = 0
-            session_peak = 0
-            session_max_drawdown = 0
-            
-            for trade in sorted(completed_trades, key=lambda x: x['time']):
-                session_running_pnl += trade['profit']
-                if session_running_pnl > session_peak:
-                    session_peak = session_running_pnl
-                drawdown = session_peak - session_running_pnl
-                if drawdown > session_max_drawdown:
-                    session_max_drawdown = drawdown
-            
+            # Combine lifetime and session max drawdown
             max_drawdown = max(self.lifetime_stats['lifetime_max_drawdown'], session_max_drawdown)
             
             # Get open positions for THIS bot only
@@ -644,38 +927,28 @@ class TradingBotManager:
             if open_positions is None:
                 open_positions = []
             
-            log.debug(f"Total open positions in MT5: {len(open_positions)}")
+            log.debug("Total open positions in MT5: %s", len(open_positions))
             
-            # Filter positions by THIS bot's magic number OR bot-specific comment
-            bot_positions = []
-            for pos in open_positions:
-                pos_magic = getattr(pos, 'magic', 0)
-                pos_comment = getattr(pos, 'comment', '')
-                pos_ticket = getattr(pos, 'ticket', 0)
-                pos_profit = getattr(pos, 'profit', 0)
-                
-                # STRICT position filtering - ONLY this bot's trades
-                belongs_to_bot = (
-                    pos_magic == self.unique_magic_number or 
-                    (f"TradePulse_{self.bot_id}" in pos_comment and pos_magic >= 234000)
-                )
-                
-                if belongs_to_bot:
-                    bot_positions.append(pos)
-                    log.info(f"Found bot position: ticket={pos_ticket}, magic={pos_magic}, "
-                           f"profit={pos_profit:.2f}, comment='{pos_comment}'")
-                else:
-                    log.debug(f"Skipped position: ticket={pos_ticket}, magic={pos_magic}, comment='{pos_comment}'")
-            
-            log.info(f"Bot {self.bot_id} has {len(bot_positions)} open positions out of {len(open_positions)} total")
-            
-            # Calculate unrealized P&L from THIS bot's open positions
-            unrealized_pnl = 0
-            for pos in bot_positions:
-                profit = getattr(pos, 'profit', 0)
-                commission = getattr(pos, 'commission', 0)
-                swap = getattr(pos, 'swap', 0)
-                unrealized_pnl += profit + commission + swap
+            # STRICT position filtering - ONLY this bot's trades (magic number OR bot-specific comment)
+            magic = self.unique_magic_number
+            bot_comment = f"TradePulse_{self.bot_id}"
+            bot_positions = [pos for pos in open_positions
+                             if pos.magic == magic or (bot_comment in pos.comment and pos.magic >= 234000)]
+            
+            # Unrealized P&L from THIS bot's open positions (positions carry no commission field on most builds)
+            unrealized_pnl = sum(pos.profit + getattr(pos, 'commission', 0) + pos.swap for pos in bot_positions)
+            
+            if log.isEnabledFor(logging.INFO):
+                for pos in bot_positions:
+                    log.info("Found bot position: ticket=%s, magic=%s, profit=%.2f, comment='%s'",
+                             pos.ticket, pos.magic, pos.profit, pos.comment)
+            if debug_enabled:
+                bot_tickets = {pos.ticket for pos in bot_positions}
+                for pos in open_positions:
+                    if pos.ticket not in bot_tickets:
+                        log.debug("Skipped position: ticket=%s, magic=%s, comment='%s'", pos.ticket, pos.magic, pos.comment)
+            
+            log.info("Bot %s has %s open positions out of %s total", self.bot_id, len(bot_positions), len(open_positions))
             
             # Update performance with COMBINED lifetime + session data
             self.performance.update({
@@ -689,7 +962,7 @@ class TradingBotManager:
                 'active_trades': len(bot_positions),  # Current open positions
                 'unrealized_pnl': round(unrealized_pnl, 2),  # Current unrealized
                 'total_pnl': round(total_realized_profit + unrealized_pnl, 2),  # Total realized + unrealized
-                'last_update': datetime.now().isoformat(),
+                'last_update': now_iso,
                 'magic_number': self.unique_magic_number,  # For debugging
                 'bot_start_time': self.bot_start_time.isoformat(),  # For reference
                 'lifetime_stats': {  # Include lifetime stats for frontend
@@ -716,7 +989,7 @@ class TradingBotManager:
                 })
             
             # Add current session trades
-            session_trades = sorted(bot_specific_trades, key=lambda x: x['time'], reverse=True)[:5]
+            session_trades = heapq.nlargest(5, bot_specific_trades, key=itemgetter('time'))  # same as sorted(reverse)[:5], without sorting the whole cache
             for t in session_trades:
                 all_recent_trades.append({
                     'ticket': t['ticket'],
@@ -729,14 +1002,14 @@ class TradingBotManager:
                 })
             
             # Sort by time and keep last 10
-            all_recent_trades.sort(key=lambda x: x['time'], reverse=True)
+            all_recent_trades.sort(key=itemgetter('time'), reverse=True)  # ISO strings sort chronologically
             self.performance['recent_trades'] = all_recent_trades[:10]
             
-            log.info(f"📊 Bot {self.bot_id} COMPLETE performance: {total_trades} total trades "
-                    f"(lifetime: {self.lifetime_stats['total_completed_trades']}, session: {len(completed_trades)}), "
-                    f"{win_rate:.1f}% win rate, ${total_realized_profit:.2f} realized, "
-                    f"${unrealized_pnl:.2f} unrealized, ${total_realized_profit + unrealized_pnl:.2f} total P&L, "
-                    f"W:{winning_trades}/L:{losing_trades}")
+            log.info("📊 Bot %s COMPLETE performance: %s total trades (lifetime: %s, session: %s), "
+                     "%.1f%% win rate, $%.2f realized, $%.2f unrealized, $%.2f total P&L, W:%s/L:%s",
+                     self.bot_id, total_trades, self.lifetime_stats['total_completed_trades'], session_trade_count,
+                     win_rate, total_realized_profit, unrealized_pnl, total_realized_profit + unrealized_pnl,
+                     winning_trades, losing_trades)
             
         except Exception as e:
             log.error(f"Error updating performance for bot {self.bot_id}: {e}")
@@ -744,7 +1017,7 @@ class TradingBotManager:
             self.performance.update({
                 'total_trades': 0,
                 'active_trades': 0,
-                'last_update': datetime.now().isoformat()
+                'last_update': now_iso
             })
     
     def get_trade_history(self):
@@ -755,7 +1028,7 @@ class TradingBotManager:
             
             # Skip if bot hasn't been properly initialized
             if not self.unique_magic_number or not self.bot_start_time:
-                log.debug(f"Bot {self.bot_id} not fully initialized for trade history")
+                log.debug("Bot %s not fully initialized for trade history", self.bot_id)
                 return []
                 
             # Get trade history from when this bot started
@@ -787,8 +1060,8 @@ class TradingBotManager:
                             'magic': magic_number
                         })
             
-            log.debug(f"Bot {self.bot_id} trade history: {len(bot_trades)} trades found")
-            return sorted(bot_trades, key=lambda x: x['time'], reverse=True)
+            log.debug("Bot %s trade history: %s trades found", self.bot_id, len(bot_trades))
+            return sorted(bot_trades, key=itemgetter('time'), reverse=True)
             
         except Exception as e:
             log.error(f"Error getting trade history for bot {self.bot_id}: {e}")
@@ -801,7 +1074,7 @@ class TradingBotManager:
             'strategy': self.config['strategy_name'],
             'auto_trading': self.config['auto_trading_enabled'],
             'performance': self.performance,
-            'active_trades': len(self.active_trades),
+            'active_trades': self._active_trade_count(),
             'config': self.config,
             'magic_number': self.unique_magic_number,
             'bot_start_time': self.bot_start_time.isoformat() if self.bot_start_time else None,
@@ -810,8 +1083,12 @@ class TradingBotManager:
         
     def update_config(self, new_config: Dict):
         """Update bot configuration"""
-        old_auto_trading = self.config.get('auto_trading_enabled', False)
-        self.config.update(new_config)
+        with self._config_lock:
+            old_config = self.config
+            self.config = {**old_config, **new_config}
+        old_auto_trading = old_config.get('auto_trading_enabled', False)
+        if 'strategy_name' in new_config:
+            self._strategy_cache = (None, None)
         new_auto_trading = self.config.get('auto_trading_enabled', False)
         
         log.info(f"🔧 Bot configuration updated: {new_config}")
@@ -826,14 +1103,26 @@ class TradingBotManager:
             'timestamp': datetime.now().isoformat()
         })
         
+    def _config_snapshot(self, cfg: Dict) -> Dict:
+        """CONFIG_SNAPSHOT_FIELDS of cfg, rebuilt only when the config has been replaced"""
+        # self.config is copy-on-write, so identity tells us whether it changed
+        cached_cfg, snapshot = self._snapshot_cache
+        if cached_cfg is not cfg:
+            snapshot = {key: cfg.get(key) for key in CONFIG_SNAPSHOT_FIELDS}
+            self._snapshot_cache = (cfg, snapshot)
+        return snapshot
+        
     def add_strategy(self, name: str, strategy_func: Callable):
         """Add a new trading strategy"""
         self.strategies[name] = strategy_func
+        self._strategies_cache = None
         log.info(f"Strategy '{name}' added to bot")
         
-    def get_available_strategies(self) -> List[str]:
-        """Get list of available strategies"""
-        return list_strategies()
+    def get_available_strategies(self) -> Tuple[str, ...]:
+        """Get available strategy names (built once, rebuilt after add_strategy)"""
+        if self._strategies_cache is None:
+            self._strategies_cache = tuple(list_strategies())
+        return self._strategies_cache
 
     def force_performance_update(self):
         """Force an immediate performance update - useful for debugging"""
@@ -856,15 +1145,10 @@ class TradingBotManager:
 
     def _generate_unique_magic_number(self):
         """Generate a unique magic number for this bot instance"""
-        import hashlib
-        import time
-        
-        # Create unique identifier from bot_id and timestamp
+        # Create unique identifier from bot_id and timestamp; crc32 spreads it
+        # well enough for the 66000 slots below and needs no digest/hex round trip
         unique_string = f"{self.bot_id}_{int(time.time())}"
-        hash_obj = hashlib.md5(unique_string.encode())
-        
-        # Convert to integer and ensure it's within MT5 limits (0-2147483647)
-        magic_number = int(hash_obj.hexdigest()[:8], 16) % 2147483647
+        magic_number = zlib.crc32(unique_string.encode())
         
         # Ensure it's not 0 and is in a reasonable range for our bots (234000-300000)
         magic_number = 234000 + (magic_number % 66000)
@@ -872,6 +1156,37 @@ class TradingBotManager:
         log.info(f"Generated unique magic number for bot {self.bot_id}: {magic_number}")
         return magic_number
 
+    def _attribution_info(self) -> Dict:
+        """Bot info shared by the global attribution maps"""
+        return {
+            'bot_id': self.bot_id,
+            'bot_name': bot_display_name(self.bot_id or ''),
+            'magic_number': self.unique_magic_number
+        }
+    
+    def _register_attribution(self):
+        """Add this bot's magic number and completed positions to the global maps"""
+        # The default manager has no bot_id; its trades keep the generic fallback attribution
+        if not self.bot_id or not self.unique_magic_number:
+            return
+        info = self._attribution_info()
+        with _bot_map_lock:
+            GLOBAL_BOT_MAGIC_MAP[int(self.unique_magic_number)] = info
+            for trade in self.lifetime_stats['completed_trade_history']:
+                if trade.get('position_id'):
+                    GLOBAL_BOT_POSITION_MAP[int(trade['position_id'])] = info
+    
+    def _unregister_attribution(self):
+        """Remove this bot's entries from the global maps"""
+        if not self.bot_id:
+            return
+        with _bot_map_lock:
+            if self.unique_magic_number:
+                GLOBAL_BOT_MAGIC_MAP.pop(int(self.unique_magic_number), None)
+            for trade in self.lifetime_stats['completed_trade_history']:
+                if trade.get('position_id'):
+                    GLOBAL_BOT_POSITION_MAP.pop(int(trade['position_id']), None)
+    
     def _find_recent_bot_trades_fallback(self):
         """Fallback method to find recent trades that might belong to this bot"""
         try:
@@ -885,7 +1200,8 @@ class TradingBotManager:
             
             fallback_trades = []
             if deals:
-                log.info(f"Fallback: Checking {len(deals)} deals from last 60 minutes")
+                log.info("Fallback: Checking %s deals from last 60 minutes", len(deals))
+                info_enabled = log.isEnabledFor(logging.INFO)
                 
                 for deal in deals:
                     magic_number = getattr(deal, 'magic', 0)
@@ -923,10 +1239,11 @@ class TradingBotManager:
                             'fallback': True  # Mark as fallback trade
                         })
                         
-                        log.info(f"Fallback found: Ticket={getattr(deal, 'ticket', 0)}, Magic={magic_number}, "
-                               f"Comment='{comment}', Profit={net_profit:.2f}, Time={deal_time}")
+                        if info_enabled:
+                            log.info("Fallback found: Ticket=%s, Magic=%s, Comment='%s', Profit=%.2f, Time=%s",
+                                     getattr(deal, 'ticket', 0), magic_number, comment, net_profit, deal_time)
             
-            log.info(f"Fallback search found {len(fallback_trades)} recent TradePulse trades")
+            log.info("Fallback search found %s recent TradePulse trades", len(fallback_trades))
             return fallback_trades
             
         except Exception as e:
@@ -963,10 +1280,25 @@ class TradingBotManager:
             }
             
             self.lifetime_stats['completed_trade_history'].append(trade_record)
+            self.lifetime_stats['tracked_tickets'].add(trade_record['ticket'])
             
             # Keep only last 50 completed trades
+            dropped = []
             if len(self.lifetime_stats['completed_trade_history']) > 50:
+                dropped = self.lifetime_stats['completed_trade_history'][:-50]
                 self.lifetime_stats['completed_trade_history'] = self.lifetime_stats['completed_trade_history'][-50:]
+                self.lifetime_stats['tracked_tickets'] = {t['ticket'] for t in self.lifetime_stats['completed_trade_history']}
+            
+            # Keep the global position -> bot map in step with the history window; a
+            # position can have several records, so only forget it once none is left
+            with _bot_map_lock:
+                if trade_record['position_id'] and self.bot_id:
+                    GLOBAL_BOT_POSITION_MAP[int(trade_record['position_id'])] = self._attribution_info()
+                if dropped:
+                    kept = {t['position_id'] for t in self.lifetime_stats['completed_trade_history']}
+                    for old in dropped:
+                        if old.get('position_id') and old['position_id'] not in kept:
+                            GLOBAL_BOT_POSITION_MAP.pop(int(old['position_id']), None)
             
             # Update daily stats
             today = datetime.now().strftime('%Y-%m-%d')
@@ -1006,14 +1338,13 @@ class TradingBotManager:
         try:
             # Check if we have any deals that represent completed positions
             for trade in current_bot_trades:
-                trade_key = f"{trade['position_id']}_{trade['ticket']}"
-                
                 # If this trade has profit and we haven't tracked it yet
                 if (trade['profit'] != 0 and 
-                    not any(ct['ticket'] == trade['ticket'] for ct in self.lifetime_stats['completed_trade_history'])):
+                    trade['ticket'] not in self.lifetime_stats['tracked_tickets']):
                     
                     # This is a completed trade
                     self._track_completed_trade(trade)
+                    self._close_active_trade(trade['position_id'])
                     
                     # Notify frontend about the completed trade
                     self.notify_updates({
@@ -0,0 +1,126 @@
+"""
+Indicator kernels shared by the trading strategies.
+Compiled with numba when it is installed, otherwise they run as plain numpy.
+"""
+import logging
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+if njit is None:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+_warmed_up = False
+
+@njit(cache=True, fastmath=True)
+def sma(values, period):
+    """Simple moving average of the last `period` values"""
+    return np.mean(values[-period:])
+
+@njit(cache=True, fastmath=True)
+def ema(values, period):
+    """Exponential moving average seeded with the first value"""
+    multiplier = 2.0 / (period + 1)
+    result = values[0]
+    for i in range(1, len(values)):
+        result = values[i] * multiplier + result * (1.0 - multiplier)
+    return result
+
+@njit(cache=True, fastmath=True)
+def rsi(close, period):
+    """RSI from the simple average gain/loss over the last `period` deltas"""
+    deltas = np.diff(close[-(period + 1):])
+    gain = 0.0
+    loss = 0.0
+    for d in deltas:
+        if d > 0:
+            gain += d
+        else:
+            loss -= d
+    if loss == 0:
+        return 100.0
+    rs = gain / loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+@njit(cache=True, fastmath=True)
+def bollinger(close, period, num_std):
+    """Return (sma, upper_band, lower_band) over the last `period` closes"""
+    window = close[-period:]
+    mid = np.mean(window)
+    std = np.std(window)
+    return mid, mid + num_std * std, mid - num_std * std
+
+@njit(cache=True, fastmath=True)
+def macd_history(close, fast_period, slow_period, n):
+    """MACD values (fast EMA - slow EMA) for the n windows close[:-n] .. close[:-1]"""
+    out = np.empty(n)
+    for i in range(n):
+        window = close[:len(close) - (n - i)]
+        out[i] = ema(window, fast_period) - ema(window, slow_period)
+    return out
+
+@njit(cache=True)  # no fastmath: NaN is a meaningful result here
+def stochastic_k_history(high, low, close, k_period, n):
+    """
+    %K for the n bars before the current one, each over the k_period bars
+    preceding it; NaN where the range is flat
+    """
+    out = np.empty(n)
+    for i in range(n):
+        end = len(close) - (n - i)
+        period_high = np.max(high[end - k_period:end])
+        period_low = np.min(low[end - k_period:end])
+        if period_high != period_low:
+            out[i] = 100.0 * (close[end] - period_low) / (period_high - period_low)
+        else:
+            out[i] = np.nan
+    return out
+
+@njit(cache=True)  # no fastmath: NaN is a meaningful result here
+def vwap(high, low, close, volume, period):
+    """Volume-weighted typical price over the last `period` bars; NaN if there was no volume"""
+    total_volume_price = 0.0
+    total_volume = 0.0
+    for i in range(len(close) - period, len(close)):
+        typical_price = (high[i] + low[i] + close[i]) / 3.0
+        total_volume_price += typical_price * volume[i]
+        total_volume += volume[i]
+    if total_volume == 0:
+        return np.nan
+    return total_volume_price / total_volume
+
+def warmup():
+    """Run each kernel once so numba compiles (or loads its cache) before the bot loop starts"""
+    global _warmed_up
+    if _warmed_up:
+        return
+    try:
+        # Strategies pass field views of the MT5 rates array (strided, no copy),
+        # so compile for that layout as well as for plain contiguous arrays
+        bars = np.zeros(100, dtype=[('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                                    ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+                                    ('real_volume', '<u8')])
+        bars['close'] = np.linspace(100.0, 110.0, 100)
+        bars['high'] = bars['close'] + 1.0
+        bars['low'] = bars['close'] - 1.0
+        for close, high, low in ((bars['close'], bars['high'], bars['low']),
+                                 (bars['close'].copy(), bars['high'].copy(), bars['low'].copy())):
+            sma(close, 20)
+            ema(close, 12)
+            rsi(close, 14)
+            bollinger(close, 20, 2.0)
+            macd_history(close, 12, 26, 9)
+            stochastic_k_history(high, low, close, 14, 3)
+            vwap(high, low, close, np.ones(100), 20)
+        _warmed_up = True
+    except Exception as e:
+        log.error(f"❌ Indicator warmup failed: {e}")
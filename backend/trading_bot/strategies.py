@@ -8,6 +8,7 @@ import logging
 import time
 from typing import Dict, Optional, List
 from datetime import datetime
+from . import indicators
 
 log = logging.getLogger(__name__)
 
@@ -46,16 +47,16 @@ class MovingAverageCrossover(BaseStrategy):
                 return None
                 
             # Extract close prices
-            close_prices = np.array([rate[4] for rate in rates])
+            close_prices = rates['close']
             
             # Calculate moving averages
-            short_ma = np.mean(close_prices[-self.short_period:])
-            long_ma = np.mean(close_prices[-self.long_period:])
+            short_ma = indicators.sma(close_prices, self.short_period)
+            long_ma = indicators.sma(close_prices, self.long_period)
             
             # Previous MAs for trend confirmation
             if len(close_prices) >= self.long_period + 1:
-                prev_short_ma = np.mean(close_prices[-self.short_period-1:-1])
-                prev_long_ma = np.mean(close_prices[-self.long_period-1:-1])
+                prev_short_ma = indicators.sma(close_prices[:-1], self.short_period)
+                prev_long_ma = indicators.sma(close_prices[:-1], self.long_period)
             else:
                 return None
             
@@ -111,20 +112,7 @@ class RSIStrategy(BaseStrategy):
         
     def calculate_rsi(self, prices: np.ndarray) -> float:
         """Calculate RSI value"""
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-self.period:])
-        avg_loss = np.mean(losses[-self.period:])
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return indicators.rsi(prices, self.period)
         
     def analyze(self, rates: np.ndarray) -> Optional[Dict]:
         """Generate signal based on RSI levels"""
@@ -132,7 +120,7 @@ class RSIStrategy(BaseStrategy):
             if len(rates) < self.period + 1:
                 return None
                 
-            close_prices = np.array([rate[4] for rate in rates])
+            close_prices = rates['close']
             current_price = close_prices[-1]
             
             rsi = self.calculate_rsi(close_prices)
@@ -203,9 +191,9 @@ class BreakoutStrategy(BaseStrategy):
                 
             # Get recent data
             recent_rates = rates[-self.lookback_period:]
-            high_prices = np.array([rate[2] for rate in recent_rates])
-            low_prices = np.array([rate[3] for rate in recent_rates])
-            close_prices = np.array([rate[4] for rate in recent_rates])
+            high_prices = recent_rates['high']
+            low_prices = recent_rates['low']
+            close_prices = recent_rates['close']
             
             current_price = close_prices[-1]
             
@@ -408,15 +396,11 @@ class BollingerBandsStrategy(BaseStrategy):
             if len(rates) < self.period:
                 return None
                 
-            close_prices = np.array([rate[4] for rate in rates])
+            close_prices = rates['close']
             current_price = close_prices[-1]
             
             # Calculate Bollinger Bands
-            sma = np.mean(close_prices[-self.period:])
-            std = np.std(close_prices[-self.period:])
-            
-            upper_band = sma + (self.std_dev * std)
-            lower_band = sma - (self.std_dev * std)
+            sma, upper_band, lower_band = indicators.bollinger(close_prices, self.period, self.std_dev)
             
             # Always log current Bollinger status for debugging
             position_pct = ((current_price - lower_band) / (upper_band - lower_band)) * 100
@@ -478,11 +462,7 @@ class MACDStrategy(BaseStrategy):
         
     def calculate_ema(self, prices: np.ndarray, period: int) -> float:
         """Calculate Exponential Moving Average"""
-        multiplier = 2 / (period + 1)
-        ema = prices[0]  # Start with first price
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
+        return indicators.ema(prices, period)
         
     def analyze(self, rates: np.ndarray) -> Optional[Dict]:
         """Generate signals based on MACD crossover"""
@@ -490,7 +470,7 @@ class MACDStrategy(BaseStrategy):
             if len(rates) < self.slow_period + self.signal_period:
                 return None
                 
-            close_prices = np.array([rate[4] for rate in rates])
+            close_prices = rates['close']
             current_price = close_prices[-1]
             
             # Calculate MACD components
@@ -501,19 +481,14 @@ class MACDStrategy(BaseStrategy):
             
             # Calculate signal line (EMA of MACD)
             if len(close_prices) >= self.slow_period + self.signal_period:
-                macd_values = []
-                for i in range(self.signal_period):
-                    idx = -(self.signal_period - i)
-                    fast = self.calculate_ema(close_prices[:idx] if idx < 0 else close_prices, self.fast_period)
-                    slow = self.calculate_ema(close_prices[:idx] if idx < 0 else close_prices, self.slow_period)
-                    macd_values.append(fast - slow)
+                macd_values = indicators.macd_history(close_prices, self.fast_period, self.slow_period, self.signal_period)
                 
-                signal_line = self.calculate_ema(np.array(macd_values), self.signal_period)
+                signal_line = self.calculate_ema(macd_values, self.signal_period)
                 
                 # Previous values for crossover detection
                 if len(macd_values) >= 2:
                     prev_macd = macd_values[-2]
-                    prev_signal = self.calculate_ema(np.array(macd_values[:-1]), self.signal_period)
+                    prev_signal = self.calculate_ema(macd_values[:-1], self.signal_period)
                     
                     signal = None
                     
@@ -569,14 +544,14 @@ class StochasticStrategy(BaseStrategy):
                 return None
                 
             # Get price data
-            high_prices = np.array([rate[2] for rate in rates[-self.k_period:]])
-            low_prices = np.array([rate[3] for rate in rates[-self.k_period:]])
-            close_prices = np.array([rate[4] for rate in rates])
+            high_prices = rates['high']
+            low_prices = rates['low']
+            close_prices = rates['close']
             current_price = close_prices[-1]
             
             # Calculate %K
-            highest_high = np.max(high_prices)
-            lowest_low = np.min(low_prices)
+            highest_high = np.max(high_prices[-self.k_period:])
+            lowest_low = np.min(low_prices[-self.k_period:])
             
             if highest_high == lowest_low:
                 return None
@@ -585,19 +560,11 @@ class StochasticStrategy(BaseStrategy):
             
             # Calculate %D (SMA of %K)
             if len(close_prices) >= self.k_period + self.d_period:
-                k_values = []
-                for i in range(self.d_period):
-                    idx = -(self.d_period - i)
-                    period_high = np.max([rate[2] for rate in rates[idx-self.k_period:idx if idx < 0 else len(rates)]])
-                    period_low = np.min([rate[3] for rate in rates[idx-self.k_period:idx if idx < 0 else len(rates)]])
-                    period_close = rates[idx][4] if idx < 0 else rates[-1][4]
-                    
-                    if period_high != period_low:
-                        k_val = 100 * (period_close - period_low) / (period_high - period_low)
-                        k_values.append(k_val)
+                k_values = indicators.stochastic_k_history(high_prices, low_prices, close_prices,
+                                                           self.k_period, self.d_period)
                 
-                if len(k_values) >= self.d_period:
-                    d_percent = np.mean(k_values[-self.d_period:])
+                if not np.isnan(k_values).any():
+                    d_percent = np.mean(k_values)
                     
                     signal = None
                     
@@ -650,22 +617,15 @@ class VolumeWeightedStrategy(BaseStrategy):
             if len(rates) < self.period:
                 return None
                 
-            recent_rates = rates[-self.period:]
-            
-            # Calculate VWAP
-            total_volume_price = 0
-            total_volume = 0
-            
-            for rate in recent_rates:
-                typical_price = (rate[2] + rate[3] + rate[4]) / 3  # (H+L+C)/3
-                volume = rate[5] if len(rate) > 5 else 1000  # Use tick volume or default
-                total_volume_price += typical_price * volume
-                total_volume += volume
-            
-            if total_volume == 0:
+            # Calculate VWAP from typical price (H+L+C)/3 weighted by tick volume
+            vwap = indicators.vwap(rates['high'],
+                                   rates['low'],
+                                   rates['close'],
+                                   rates['tick_volume'].astype(np.float64),
+                                   self.period)
+            if np.isnan(vwap):
                 return None
                 
-            vwap = total_volume_price / total_volume
             current_price = rates[-1][4]
             
             # Calculate price deviation from VWAP
@@ -642,6 +642,24 @@ function CandlestickChart() {
                 }
             });
 
+            // Batched candles for a timeframe switch (one frame, applied oldest first)
+            socketRef.current.on('price_update_batch', (batch) => {
+                if (!Array.isArray(batch) || !updateStats.shouldUpdate(200)) {
+                    return;
+                }
+
+                updateStats.logStats();
+
+                try {
+                    batch
+                        .filter((candle) => candle && typeof candle === 'object')
+                        .sort((a, b) => a.time - b.time)
+                        .forEach((candle) => handleCandleUpdate(candle));
+                } catch (error) {
+                    console.error('❌ Error processing price update batch:', error);
+                }
+            });
+
             // Handle trade execution events with throttling
             socketRef.current.on('trade_executed', (data) => {
                 // No throttling for trade execution - these are important events
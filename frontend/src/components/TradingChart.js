@@ -93,6 +93,25 @@ const TradingChart = () => {
             }
         });
 
+        // Batched candles (one frame, applied oldest first)
+        socketRef.current.on('price_update_batch', (batch) => {
+            if (!Array.isArray(batch) || !shouldUpdate(250)) {
+                return;
+            }
+
+            if (candlestickSeriesRef.current) {
+                try {
+                    batch
+                        .filter((candle) => candle && typeof candle === 'object')
+                        .sort((a, b) => a.time - b.time)
+                        .forEach((candle) => candlestickSeriesRef.current.update(candle));
+                    setLastUpdateTime(new Date().toLocaleTimeString());
+                } catch (error) {
+                    console.error('Error updating chart:', error);
+                }
+            }
+        });
+
         // Handle trade execution events (no throttling - important events)
         socketRef.current.on('trade_executed', (data) => {
             console.log('TradingChart: Trade executed', data);